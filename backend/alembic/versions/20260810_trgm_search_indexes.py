@@ -0,0 +1,40 @@
+"""Trigram indexes for conversation search
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-08-10
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm GIN indexes make the ILIKE '%term%' search in
+    # list_conversations an index scan instead of a full table scan
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index(
+        'idx_conversations_title_trgm',
+        'conversations',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'idx_messages_content_trgm',
+        'messages',
+        ['content'],
+        postgresql_using='gin',
+        postgresql_ops={'content': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_messages_content_trgm', table_name='messages')
+    op.drop_index('idx_conversations_title_trgm', table_name='conversations')
@@ -0,0 +1,48 @@
+"""Denormalized conversation aggregates
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-08-11
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'conversations',
+        sa.Column('message_count', sa.Integer, server_default='0', nullable=False)
+    )
+    op.add_column(
+        'conversations',
+        sa.Column('has_artifacts', sa.Boolean, server_default='false', nullable=False)
+    )
+
+    # Backfill from the existing rows
+    op.execute("""
+        UPDATE conversations c
+        SET message_count = m.cnt
+        FROM (
+            SELECT conversation_id, count(*) AS cnt
+            FROM messages
+            GROUP BY conversation_id
+        ) m
+        WHERE m.conversation_id = c.id
+    """)
+    op.execute("""
+        UPDATE conversations
+        SET has_artifacts = TRUE
+        WHERE id IN (SELECT DISTINCT conversation_id FROM artifacts)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('conversations', 'has_artifacts')
+    op.drop_column('conversations', 'message_count')
@@ -0,0 +1,39 @@
+"""Query-driven composite indexes for listing
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-08-12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covered by the leading column of idx_message_sequence
+    op.drop_index('idx_message_conversation', table_name='messages')
+
+    # Replace the single-column provider index with composites matching the
+    # listing query's filter + ORDER BY started_at DESC
+    op.drop_index('idx_conversation_provider', table_name='conversations')
+    op.create_index(
+        'idx_conv_provider_started', 'conversations',
+        ['provider_id', sa.text('started_at DESC')]
+    )
+    op.create_index(
+        'idx_conv_archived_started', 'conversations',
+        ['archived', 'started_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conv_archived_started', table_name='conversations')
+    op.drop_index('idx_conv_provider_started', table_name='conversations')
+    op.create_index('idx_conversation_provider', 'conversations', ['provider_id'])
+    op.create_index('idx_message_conversation', 'messages', ['conversation_id'])
@@ -0,0 +1,30 @@
+"""GIN index on message metadata
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-08-13
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops is smaller than the default jsonb_ops and covers the
+    # @> containment operator, the only access path metadata queries use
+    op.create_index(
+        'idx_message_meta_gin',
+        'messages',
+        ['raw_metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'raw_metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_message_meta_gin', table_name='messages')
@@ -0,0 +1,64 @@
+"""Store API keys as raw encrypted bytes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-08-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Imported here so alembic can build the revision map without
+    # backend/ on sys.path (env.py only arranges that for actual runs)
+    from app.services.encryption import _encrypt_raw, get_cipher
+
+    # Text -> BYTEA; existing base64 Fernet tokens survive as their ASCII
+    # bytes, and decrypt_api_key can still read them by version byte
+    op.alter_column(
+        'api_keys', 'key_encrypted',
+        type_=sa.LargeBinary,
+        postgresql_using="convert_to(key_encrypted, 'UTF8')"
+    )
+
+    # Re-encrypt in place so the runtime fallback path is never needed
+    bind = op.get_bind()
+    cipher = get_cipher()
+    rows = bind.execute(
+        sa.text("SELECT id, key_encrypted FROM api_keys")
+    ).fetchall()
+    for key_id, token in rows:
+        plaintext = cipher.decrypt(bytes(token))
+        bind.execute(
+            sa.text("UPDATE api_keys SET key_encrypted = :value WHERE id = :id"),
+            {"value": _encrypt_raw(plaintext), "id": key_id}
+        )
+
+
+def downgrade() -> None:
+    from app.services.encryption import decrypt_api_key, get_cipher
+
+    bind = op.get_bind()
+    cipher = get_cipher()
+    rows = bind.execute(
+        sa.text("SELECT id, key_encrypted FROM api_keys")
+    ).fetchall()
+    for key_id, token in rows:
+        plaintext = decrypt_api_key(bytes(token))
+        bind.execute(
+            sa.text("UPDATE api_keys SET key_encrypted = :value WHERE id = :id"),
+            {"value": cipher.encrypt(plaintext.encode()), "id": key_id}
+        )
+
+    op.alter_column(
+        'api_keys', 'key_encrypted',
+        type_=sa.Text,
+        postgresql_using="convert_from(key_encrypted, 'UTF8')"
+    )
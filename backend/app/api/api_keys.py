@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import APIKey, Provider
 from ..services import encrypt_api_key
 from .schemas import APIKeyCreate, APIKeyResponse, APIKeyUpdate
@@ -12,20 +13,30 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[APIKeyResponse])
-def list_api_keys(db: Session = Depends(get_db)):
-    """List all API keys (without exposing actual key values)."""
-    api_keys = db.query(APIKey).all()
-    return api_keys
+async def list_api_keys(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List API keys with pagination (without exposing actual key values)."""
+    offset = (page - 1) * page_size
+
+    # lambda_stmt caches the compiled SQL across requests; only the
+    # limit/offset bind values change per call
+    stmt = lambda_stmt(lambda: select(APIKey).order_by(APIKey.created_at.desc()))
+    stmt += lambda s: s.limit(page_size).offset(offset)
+
+    return (await db.scalars(stmt)).all()
 
 
 @router.post("", response_model=APIKeyResponse)
-def create_api_key(
+async def create_api_key(
     api_key_data: APIKeyCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new API key."""
     # Verify provider exists
-    provider = db.query(Provider).filter(Provider.id == api_key_data.provider_id).first()
+    provider = await db.get(Provider, api_key_data.provider_id)
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
@@ -40,20 +51,20 @@ def create_api_key(
     )
 
     db.add(api_key)
-    db.commit()
-    db.refresh(api_key)
+    await db.commit()
+    await db.refresh(api_key)
 
     return api_key
 
 
 @router.patch("/{api_key_id}", response_model=APIKeyResponse)
-def update_api_key(
+async def update_api_key(
     api_key_id: UUID,
     update_data: APIKeyUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an API key (label or active status)."""
-    api_key = db.query(APIKey).filter(APIKey.id == api_key_id).first()
+    api_key = await db.get(APIKey, api_key_id)
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
 
@@ -62,23 +73,23 @@ def update_api_key(
     if update_data.is_active is not None:
         api_key.is_active = update_data.is_active
 
-    db.commit()
-    db.refresh(api_key)
+    await db.commit()
+    await db.refresh(api_key)
 
     return api_key
 
 
 @router.delete("/{api_key_id}")
-def delete_api_key(
+async def delete_api_key(
     api_key_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an API key."""
-    api_key = db.query(APIKey).filter(APIKey.id == api_key_id).first()
+    api_key = await db.get(APIKey, api_key_id)
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
 
-    db.delete(api_key)
-    db.commit()
+    await db.delete(api_key)
+    await db.commit()
 
     return {"message": "API key deleted successfully"}
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import base64
+import binascii
 from uuid import UUID
 from datetime import datetime
 
-from ..database import get_db
-from ..models import Conversation, Message, Artifact, Project, ConversationProject, Provider
+from ..database import get_async_db
+from ..models import Conversation, Message, Project, ConversationProject, Provider
 from .schemas import (
     ConversationListItem,
+    ConversationListPage,
     ConversationDetail,
     ConversationProjectAssign,
     MessageResponse,
@@ -19,20 +26,40 @@ from .schemas import (
 router = APIRouter()
 
 
-@router.get("", response_model=List[ConversationListItem])
-def list_conversations(
+def _encode_cursor(conversation) -> str:
+    """Encode a (started_at, id) keyset position as an opaque cursor."""
+    started_at = conversation.started_at.isoformat() if conversation.started_at else ""
+    raw = f"{started_at}|{conversation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """Decode a cursor back into its (started_at, id) keyset position."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        started_raw, _, id_raw = raw.partition("|")
+        return (
+            datetime.fromisoformat(started_raw) if started_raw else None,
+            UUID(id_raw)
+        )
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=ConversationListPage)
+async def list_conversations(
     provider_id: Optional[UUID] = None,
     project_id: Optional[UUID] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     search: Optional[str] = None,
     has_artifacts: Optional[bool] = None,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = None,
     page_size: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List conversations with filtering and pagination.
+    List conversations with filtering and keyset pagination.
 
     Filters:
     - provider_id: Filter by provider
@@ -40,28 +67,41 @@ def list_conversations(
     - from_date/to_date: Filter by conversation start date
     - search: Search in titles and message content
     - has_artifacts: Filter conversations with/without artifacts
+
+    Pass the next_cursor from a previous page to continue from there.
     """
-    query = db.query(Conversation)
+    # Select only the columns the response needs; plain Row tuples skip
+    # ORM hydration and identity-map bookkeeping entirely
+    stmt = select(
+        Conversation.id,
+        Conversation.provider_id,
+        Conversation.title,
+        Conversation.started_at,
+        Conversation.message_count,
+        Conversation.has_artifacts
+    )
 
     # Apply filters
     if provider_id:
-        query = query.filter(Conversation.provider_id == provider_id)
+        stmt = stmt.where(Conversation.provider_id == provider_id)
 
     if project_id:
-        query = query.join(ConversationProject).filter(
+        stmt = stmt.join(ConversationProject).where(
             ConversationProject.project_id == project_id
         )
 
     if from_date:
-        query = query.filter(Conversation.started_at >= from_date)
+        stmt = stmt.where(Conversation.started_at >= from_date)
 
     if to_date:
-        query = query.filter(Conversation.started_at <= to_date)
+        stmt = stmt.where(Conversation.started_at <= to_date)
 
     if search:
-        # Search in conversation titles and message content
+        # Search in conversation titles and message content. Both ILIKE
+        # predicates are served by the pg_trgm GIN indexes
+        # (idx_conversations_title_trgm / idx_messages_content_trgm)
         search_term = f"%{search}%"
-        query = query.outerjoin(Message).filter(
+        stmt = stmt.outerjoin(Message).where(
             or_(
                 Conversation.title.ilike(search_term),
                 Message.content.ilike(search_term)
@@ -69,63 +109,91 @@ def list_conversations(
         ).distinct()
 
     if has_artifacts is not None:
-        if has_artifacts:
-            query = query.join(Artifact).distinct()
+        stmt = stmt.where(Conversation.has_artifacts == has_artifacts)
+
+    # Keyset pagination: no expensive count() re-running the filters, and
+    # no OFFSET scan cost that grows with page number. started_at is
+    # nullable and NULLs sort first under DESC, so the NULL block is
+    # keyed by id alone and dated rows by (started_at, id)
+    if cursor:
+        cursor_started_at, cursor_id = _decode_cursor(cursor)
+        if cursor_started_at is None:
+            # Cursor row had no started_at: the rest of the NULL block,
+            # then every dated row, is still ahead
+            stmt = stmt.where(
+                or_(
+                    and_(
+                        Conversation.started_at.is_(None),
+                        Conversation.id < cursor_id
+                    ),
+                    Conversation.started_at.isnot(None)
+                )
+            )
         else:
-            query = query.outerjoin(Artifact).filter(Artifact.id.is_(None))
-
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    conversations = query.order_by(Conversation.started_at.desc()).offset(offset).limit(page_size).all()
-
-    # Build response with message counts and projects
-    result = []
-    for conv in conversations:
-        message_count = db.query(func.count(Message.id)).filter(
-            Message.conversation_id == conv.id
-        ).scalar()
-
-        has_artifacts_flag = db.query(
-            db.query(Artifact).filter(Artifact.conversation_id == conv.id).exists()
-        ).scalar()
-
-        projects = db.query(Project).join(ConversationProject).filter(
-            ConversationProject.conversation_id == conv.id
-        ).all()
+            # The NULL block was fully emitted on earlier pages
+            stmt = stmt.where(
+                and_(
+                    Conversation.started_at.isnot(None),
+                    tuple_(Conversation.started_at, Conversation.id)
+                    < (cursor_started_at, cursor_id)
+                )
+            )
 
-        result.append(ConversationListItem(
-            id=conv.id,
-            provider_id=conv.provider_id,
-            title=conv.title,
-            started_at=conv.started_at,
-            message_count=message_count,
-            has_artifacts=has_artifacts_flag,
-            projects=[p.name for p in projects]
-        ))
+    rows = (await db.execute(
+        stmt.order_by(
+            Conversation.started_at.desc().nullsfirst(), Conversation.id.desc()
+        ).limit(page_size + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1])
+
+    conv_ids = [row.id for row in rows]
+
+    # message_count/has_artifacts are denormalized onto conversations;
+    # only project names still need a (single, batched) query
+    project_names = {}
+    if conv_ids:
+        for conv_id, project_name in await db.execute(
+            select(ConversationProject.conversation_id, Project.name)
+            .join(Project)
+            .where(ConversationProject.conversation_id.in_(conv_ids))
+        ):
+            project_names.setdefault(conv_id, []).append(project_name)
+
+    # Build response straight from the row mappings
+    result = [
+        ConversationListItem.model_validate(
+            {**row._mapping, "projects": project_names.get(row.id, [])}
+        )
+        for row in rows
+    ]
 
-    return result
+    return ConversationListPage(items=result, next_cursor=next_cursor)
 
 
 @router.get("/{conversation_id}", response_model=ConversationDetail)
-def get_conversation(
+async def get_conversation(
     conversation_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get full conversation details including messages and artifacts."""
-    conversation = db.query(Conversation).options(
-        joinedload(Conversation.messages),
-        joinedload(Conversation.artifacts),
-        joinedload(Conversation.conversation_projects).joinedload(ConversationProject.project)
-    ).filter(Conversation.id == conversation_id).first()
+    conversation = (await db.execute(
+        select(Conversation).options(
+            selectinload(Conversation.messages),
+            selectinload(Conversation.artifacts),
+            selectinload(Conversation.conversation_projects).selectinload(ConversationProject.project),
+            # Any other relationship access is a bug, not a silent N+1
+            raiseload('*')
+        ).where(Conversation.id == conversation_id)
+    )).scalars().first()
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    # Sort messages by sequence
-    messages = sorted(conversation.messages, key=lambda m: m.sequence_index)
+    # Messages arrive pre-sorted via the relationship's order_by
 
     # Get projects
     projects = [cp.project for cp in conversation.conversation_projects]
@@ -139,87 +207,80 @@ def get_conversation(
         ended_at=conversation.ended_at,
         origin=conversation.origin,
         archived=conversation.archived,
-        messages=[MessageResponse.model_validate(m) for m in messages],
+        messages=[MessageResponse.model_validate(m) for m in conversation.messages],
         artifacts=[ArtifactResponse.model_validate(a) for a in conversation.artifacts],
         projects=[ProjectResponse.model_validate(p) for p in projects]
     )
 
 
 @router.post("/{conversation_id}/projects")
-def assign_project_to_conversation(
+async def assign_project_to_conversation(
     conversation_id: UUID,
     data: ConversationProjectAssign,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign a project to a conversation."""
-    # Verify conversation exists
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
-    if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Verify project exists
-    project = db.query(Project).filter(Project.id == data.project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    # Single INSERT ... ON CONFLICT DO NOTHING instead of three existence
+    # SELECTs followed by an insert; missing conversation/project surfaces
+    # as an FK violation
+    stmt = (
+        pg_insert(ConversationProject)
+        .values(conversation_id=conversation_id, project_id=data.project_id)
+        .on_conflict_do_nothing(index_elements=["conversation_id", "project_id"])
+        .returning(ConversationProject.conversation_id)
+    )
 
-    # Check if already assigned
-    existing = db.query(ConversationProject).filter(
-        ConversationProject.conversation_id == conversation_id,
-        ConversationProject.project_id == data.project_id
-    ).first()
+    try:
+        inserted = (await db.execute(stmt)).first() is not None
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Conversation or project not found")
 
-    if existing:
+    if not inserted:
         return {"message": "Project already assigned to conversation"}
 
-    # Create assignment
-    cp = ConversationProject(
-        conversation_id=conversation_id,
-        project_id=data.project_id
-    )
-    db.add(cp)
-    db.commit()
-
     return {"message": "Project assigned successfully"}
 
 
 @router.delete("/{conversation_id}/projects/{project_id}")
-def remove_project_from_conversation(
+async def remove_project_from_conversation(
     conversation_id: UUID,
     project_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove a project from a conversation."""
-    cp = db.query(ConversationProject).filter(
-        ConversationProject.conversation_id == conversation_id,
-        ConversationProject.project_id == project_id
-    ).first()
+    cp = await db.get(ConversationProject, (conversation_id, project_id))
 
     if not cp:
         raise HTTPException(status_code=404, detail="Project assignment not found")
 
-    db.delete(cp)
-    db.commit()
+    await db.delete(cp)
+    await db.commit()
 
     return {"message": "Project removed from conversation"}
 
 
 @router.get("/{conversation_id}/export-markdown")
-def export_conversation_to_markdown(
+async def export_conversation_to_markdown(
     conversation_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Export a conversation to Markdown format."""
-    conversation = db.query(Conversation).options(
-        joinedload(Conversation.messages),
-        joinedload(Conversation.artifacts),
-        joinedload(Conversation.conversation_projects).joinedload(ConversationProject.project)
-    ).filter(Conversation.id == conversation_id).first()
+    # Messages are streamed separately below rather than loaded up front
+    conversation = (await db.execute(
+        select(Conversation).options(
+            selectinload(Conversation.artifacts),
+            selectinload(Conversation.conversation_projects).selectinload(ConversationProject.project),
+            raiseload('*')
+        ).where(Conversation.id == conversation_id)
+    )).scalars().first()
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Get provider info
-    provider = db.query(Provider).filter(Provider.id == conversation.provider_id).first()
+    provider = await db.get(Provider, conversation.provider_id)
 
     # Build Markdown content
     md_lines = []
@@ -244,37 +305,46 @@ def export_conversation_to_markdown(
         md_lines.append(f"- **Projects:** {project_names}")
 
     md_lines.append("\n---\n")
-
-    # Messages
     md_lines.append("## Conversation\n")
-    messages = sorted(conversation.messages, key=lambda m: m.sequence_index)
-
-    for msg in messages:
-        role_display = msg.role.capitalize()
-        md_lines.append(f"**{role_display}:**\n")
-        md_lines.append(f"{msg.content}\n")
 
     # Artifacts
+    artifact_lines = []
     if conversation.artifacts:
-        md_lines.append("\n---\n")
-        md_lines.append("## Attachments\n")
+        artifact_lines.append("\n---\n")
+        artifact_lines.append("## Attachments\n")
         for artifact in conversation.artifacts:
             filename = artifact.filename or "Unknown"
             artifact_type = artifact.artifact_type
             status = artifact.download_status
-            md_lines.append(f"- **{filename}** ({artifact_type}, status: {status})")
+            artifact_lines.append(f"- **{filename}** ({artifact_type}, status: {status})")
             if artifact.storage_path:
-                md_lines.append(f"  - Path: {artifact.storage_path}")
+                artifact_lines.append(f"  - Path: {artifact.storage_path}")
             if artifact.download_error:
-                md_lines.append(f"  - Error: {artifact.download_error}")
-            md_lines.append("")
+                artifact_lines.append(f"  - Error: {artifact.download_error}")
+            artifact_lines.append("")
+
+    async def generate():
+        """Yield the export incrementally so large conversations never sit
+        fully in memory and the client gets bytes during DB iteration."""
+        yield "\n".join(md_lines) + "\n"
+
+        messages = await db.stream(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.sequence_index)
+            .execution_options(yield_per=200)
+        )
+
+        async for msg in messages.scalars():
+            yield f"**{msg.role.capitalize()}:**\n\n{msg.content}\n\n"
 
-    markdown_content = "\n".join(md_lines)
+        if artifact_lines:
+            yield "\n".join(artifact_lines)
 
     # Return as downloadable file
     filename = f"{conversation.id}.md"
-    return Response(
-        content=markdown_content,
+    return StreamingResponse(
+        generate(),
         media_type="text/markdown",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
@@ -1,66 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from sqlalchemy import select, insert, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
+import asyncio
+import json
+import uuid
 
-from ..database import get_db
+from ..database import get_async_db, AsyncSessionLocal
 from ..models import ImportJob, APIKey, Provider, Conversation, Message, Artifact
 from ..services import decrypt_api_key
-from ..providers.registry import provider_registry
+from ..providers import registry
 from .schemas import ImportJobCreate, ImportJobResponse
 
 router = APIRouter()
 
+# Batches at or above this size go through COPY instead of multi-row INSERT
+COPY_BATCH_THRESHOLD = 500
 
-async def run_import_job(job_id: UUID, db_url: str):
+# Conversations imported between commits; amortizes fsync/WAL flush cost
+COMMIT_EVERY = 50
+
+# Concurrent fetch_conversation calls against the provider API
+FETCH_CONCURRENCY = 8
+
+MESSAGE_COPY_COLUMNS = (
+    "id", "conversation_id", "provider_message_id", "role",
+    "content", "created_at", "sequence_index", "raw_metadata"
+)
+ARTIFACT_COPY_COLUMNS = (
+    "id", "conversation_id", "artifact_type", "provider_artifact_id",
+    "filename", "mime_type", "download_status", "download_error", "raw_metadata"
+)
+
+
+async def _copy_rows(db: AsyncSession, table: str, columns: tuple, rows: List[dict]):
+    """
+    Stream row mappings into a table via asyncpg's binary COPY.
+
+    COPY avoids per-row parse/plan overhead entirely, which matters for
+    imports carrying thousands of messages per conversation. Runs on the
+    session's own connection, so it participates in the current
+    transaction/savepoint.
+    """
+    records = [
+        tuple(
+            json.dumps(value) if isinstance(value, dict) else value
+            for value in (row[col] for col in columns)
+        )
+        for row in rows
+    ]
+
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table, records=records, columns=list(columns)
+    )
+
+
+async def run_import_job(job_id: UUID):
     """
     Background task to run an import job.
 
     This is a simplified implementation. In production, you might want to use
     Celery, RQ, or another task queue for better reliability.
     """
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
-
-    # Create a new database session for the background task
-    engine = create_engine(db_url)
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
-
-    try:
-        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    # Reuse the shared async engine's connection pool rather than paying
+    # engine and pool construction on every job
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ImportJob, job_id)
         if not job:
             return
 
         # Get API key and decrypt it
-        api_key_record = db.query(APIKey).filter(APIKey.id == job.api_key_id).first()
+        api_key_record = await db.get(APIKey, job.api_key_id)
         if not api_key_record:
             job.status = "failed"
             job.error_details = "API key not found"
             job.finished_at = datetime.now()
-            db.commit()
+            await db.commit()
             return
 
         api_key = decrypt_api_key(api_key_record.key_encrypted)
 
         # Get provider info
-        provider = db.query(Provider).filter(Provider.id == job.provider_id).first()
+        provider = await db.get(Provider, job.provider_id)
         if not provider:
             job.status = "failed"
             job.error_details = "Provider not found"
             job.finished_at = datetime.now()
-            db.commit()
+            await db.commit()
             return
 
-        # Get provider adapter
-        try:
-            adapter = provider_registry.get_adapter(provider.name)
-        except ValueError as e:
+        # Get provider adapter; absence is an expected job failure, not an
+        # exceptional condition
+        adapter = registry.provider_registry.find_adapter(provider.name)
+        if adapter is None:
             job.status = "failed"
-            job.error_details = str(e)
+            job.error_details = f"Unknown provider: {provider.name}"
             job.finished_at = datetime.now()
-            db.commit()
+            await db.commit()
             return
 
         # Build options from requested range
@@ -78,74 +118,161 @@ async def run_import_job(job_id: UUID, db_url: str):
             # List conversations
             conv_summaries = await adapter.list_conversations(api_key, options)
 
-            for summary in conv_summaries:
-                try:
-                    # Fetch full conversation
-                    conv_detail = await adapter.fetch_conversation(
+            # One IN query for already-imported conversations instead of a
+            # SELECT per summary; skipping them up front also avoids
+            # re-fetching their content from the provider
+            existing_ids = set()
+            if conv_summaries:
+                existing_ids = set((await db.scalars(
+                    select(Conversation.provider_conversation_id).where(
+                        Conversation.provider_id == provider.id,
+                        Conversation.provider_conversation_id.in_(
+                            [s.provider_conversation_id for s in conv_summaries]
+                        )
+                    )
+                )).all())
+
+            conv_summaries = [
+                summary for summary in conv_summaries
+                if summary.provider_conversation_id not in existing_ids
+            ]
+
+            # Fetch conversations concurrently (bounded) so provider HTTP
+            # round trips overlap instead of running end to end
+            sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+            async def fetch_one(summary):
+                async with sem:
+                    return await adapter.fetch_conversation(
                         api_key,
                         summary.provider_conversation_id
                     )
 
-                    # Check if conversation already exists
-                    existing = db.query(Conversation).filter(
-                        Conversation.provider_id == provider.id,
-                        Conversation.provider_conversation_id == conv_detail.provider_conversation_id
-                    ).first()
+            def fetch_window(window):
+                return asyncio.gather(
+                    *(fetch_one(summary) for summary in window),
+                    return_exceptions=True
+                )
+
+            # Window the fetches to the commit batch size so at most two
+            # windows of conversation details are ever in memory: the one
+            # being written and the one being fetched behind it
+            windows = [
+                conv_summaries[start:start + COMMIT_EVERY]
+                for start in range(0, len(conv_summaries), COMMIT_EVERY)
+            ]
+            next_fetch = asyncio.ensure_future(fetch_window(windows[0])) if windows else None
+
+            pending = 0
+
+            for window_index, window in enumerate(windows):
+                details = await next_fetch
+                if window_index + 1 < len(windows):
+                    next_fetch = asyncio.ensure_future(
+                        fetch_window(windows[window_index + 1])
+                    )
 
-                    if existing:
-                        # Skip duplicate
+                # DB writes stay in listing order
+                for summary, conv_detail in zip(window, details):
+                    try:
+                        if isinstance(conv_detail, BaseException):
+                            raise conv_detail
+
+                        # Savepoint per conversation so a bad one rolls back
+                        # alone without losing the rest of the batch
+                        async with db.begin_nested():
+                            # Create conversation
+                            conversation = Conversation(
+                                provider_id=provider.id,
+                                provider_conversation_id=conv_detail.provider_conversation_id,
+                                title=conv_detail.title,
+                                started_at=conv_detail.started_at,
+                                ended_at=conv_detail.ended_at,
+                                import_job_id=job.id,
+                                raw_metadata=conv_detail.raw_metadata,
+                                # Denormalized aggregates read by list_conversations
+                                message_count=len(conv_detail.messages),
+                                has_artifacts=bool(conv_detail.artifacts)
+                            )
+                            db.add(conversation)
+                            await db.flush()  # Get conversation ID
+
+                            # Import messages and artifacts with bulk inserts
+                            # instead of one ORM add/flush per row. IDs are
+                            # pre-generated so no RETURNING round trip is needed.
+                            message_rows = [
+                                {
+                                    "id": uuid.uuid4(),
+                                    "conversation_id": conversation.id,
+                                    "provider_message_id": msg.provider_message_id,
+                                    "role": msg.role,
+                                    "content": msg.content,
+                                    "created_at": msg.created_at,
+                                    "sequence_index": msg.sequence_index,
+                                    "raw_metadata": msg.raw_metadata
+                                }
+                                for msg in conv_detail.messages
+                            ]
+                            if message_rows:
+                                if len(message_rows) >= COPY_BATCH_THRESHOLD:
+                                    await _copy_rows(db, "messages", MESSAGE_COPY_COLUMNS, message_rows)
+                                else:
+                                    await db.execute(insert(Message), message_rows)
+
+                            artifact_rows = [
+                                {
+                                    "id": uuid.uuid4(),
+                                    "conversation_id": conversation.id,
+                                    "artifact_type": art.artifact_type,
+                                    "provider_artifact_id": art.provider_artifact_id,
+                                    "filename": art.filename,
+                                    "mime_type": art.mime_type,
+                                    "download_status": art.download_status,
+                                    "download_error": art.download_error,
+                                    "raw_metadata": art.raw_metadata
+                                }
+                                for art in conv_detail.artifacts
+                            ]
+                            if artifact_rows:
+                                if len(artifact_rows) >= COPY_BATCH_THRESHOLD:
+                                    await _copy_rows(db, "artifacts", ARTIFACT_COPY_COLUMNS, artifact_rows)
+                                else:
+                                    await db.execute(insert(Artifact), artifact_rows)
+
+                        conversations_count += 1
+                        messages_count += len(message_rows)
+                        artifacts_count += len(artifact_rows)
+
+                        # Amortize fsync cost: commit once per batch of
+                        # conversations rather than once per conversation
+                        pending += 1
+                        if pending >= COMMIT_EVERY:
+                            await db.commit()
+                            # Drop the freshly imported objects from the identity
+                            # map so session memory stays flat over large imports
+                            db.expunge_all()
+                            pending = 0
+
+                    except Exception as e:
+                        errors.append(f"Error importing conversation {summary.provider_conversation_id}: {str(e)}")
+                        # A failure outside the savepoint (e.g. the batch
+                        # commit) leaves the session pending-rollback; reset it
+                        # so the remaining conversations don't all fail with
+                        # PendingRollbackError. The uncommitted batch is lost
+                        # either way, so restart the batch counter.
+                        if db.in_transaction() and not db.sync_session.is_active:
+                            await db.rollback()
+                            pending = 0
                         continue
 
-                    # Create conversation
-                    conversation = Conversation(
-                        provider_id=provider.id,
-                        provider_conversation_id=conv_detail.provider_conversation_id,
-                        title=conv_detail.title,
-                        started_at=conv_detail.started_at,
-                        ended_at=conv_detail.ended_at,
-                        import_job_id=job.id,
-                        raw_metadata=conv_detail.raw_metadata
-                    )
-                    db.add(conversation)
-                    db.flush()  # Get conversation ID
-
-                    conversations_count += 1
-
-                    # Import messages
-                    for msg in conv_detail.messages:
-                        message = Message(
-                            conversation_id=conversation.id,
-                            provider_message_id=msg.provider_message_id,
-                            role=msg.role,
-                            content=msg.content,
-                            created_at=msg.created_at,
-                            sequence_index=msg.sequence_index,
-                            raw_metadata=msg.raw_metadata
-                        )
-                        db.add(message)
-                        messages_count += 1
-
-                    # Import artifacts
-                    for art in conv_detail.artifacts:
-                        artifact = Artifact(
-                            conversation_id=conversation.id,
-                            artifact_type=art.artifact_type,
-                            provider_artifact_id=art.provider_artifact_id,
-                            filename=art.filename,
-                            mime_type=art.mime_type,
-                            download_status=art.download_status,
-                            download_error=art.download_error,
-                            raw_metadata=art.raw_metadata
-                        )
-                        db.add(artifact)
-                        artifacts_count += 1
-
-                    db.commit()
+            if pending:
+                await db.commit()
+            db.expunge_all()
 
-                except Exception as e:
-                    errors.append(f"Error importing conversation {summary.provider_conversation_id}: {str(e)}")
-                    db.rollback()
-                    continue
+            # Re-attach the rows the job summary still updates; everything
+            # else imported stays released
+            job = await db.merge(job)
+            api_key_record = await db.merge(api_key_record)
 
             # Update job status
             job.status = "success" if not errors else "partial"
@@ -160,50 +287,57 @@ async def run_import_job(job_id: UUID, db_url: str):
             # Update API key last used
             api_key_record.last_used_at = datetime.now()
 
-            db.commit()
+            await db.commit()
 
         except Exception as e:
+            # A DB error arriving here leaves the session pending-rollback,
+            # and merge would re-raise instead of recording the failure
+            if db.in_transaction() and not db.sync_session.is_active:
+                await db.rollback()
+            job = await db.merge(job)
             job.status = "failed"
             job.error_details = str(e)
             job.finished_at = datetime.now()
-            db.commit()
-
-    finally:
-        db.close()
+            await db.commit()
 
 
 @router.get("", response_model=List[ImportJobResponse])
-def list_import_jobs(
+async def list_import_jobs(
     provider_id: Optional[UUID] = None,
-    db: Session = Depends(get_db)
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List import jobs with optional provider filter."""
-    query = db.query(ImportJob)
+    """List import jobs with optional provider filter and pagination."""
+    offset = (page - 1) * page_size
 
+    # lambda_stmt caches the compiled SQL across requests; only the
+    # bind values change per call
+    stmt = lambda_stmt(lambda: select(ImportJob))
     if provider_id:
-        query = query.filter(ImportJob.provider_id == provider_id)
+        stmt += lambda s: s.where(ImportJob.provider_id == provider_id)
+    stmt += lambda s: s.order_by(ImportJob.started_at.desc()).limit(page_size).offset(offset)
 
-    jobs = query.order_by(ImportJob.started_at.desc()).all()
-    return jobs
+    return (await db.scalars(stmt)).all()
 
 
 @router.get("/{job_id}", response_model=ImportJobResponse)
-def get_import_job(
+async def get_import_job(
     job_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get detailed information about a specific import job."""
-    job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    job = await db.get(ImportJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Import job not found")
     return job
 
 
 @router.post("", response_model=ImportJobResponse)
-def create_import_job(
+async def create_import_job(
     job_data: ImportJobCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create and start a new import job.
@@ -211,14 +345,14 @@ def create_import_job(
     The job will run in the background and import conversations from the provider.
     """
     # Verify API key exists and is active
-    api_key = db.query(APIKey).filter(APIKey.id == job_data.api_key_id).first()
+    api_key = await db.get(APIKey, job_data.api_key_id)
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
     if not api_key.is_active:
         raise HTTPException(status_code=400, detail="API key is not active")
 
     # Verify provider exists
-    provider = db.query(Provider).filter(Provider.id == job_data.provider_id).first()
+    provider = await db.get(Provider, job_data.provider_id)
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
@@ -238,12 +372,10 @@ def create_import_job(
     )
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
 
     # Start background task
-    from ..config import get_settings
-    settings = get_settings()
-    background_tasks.add_task(run_import_job, job.id, settings.database_url)
+    background_tasks.add_task(run_import_job, job.id)
 
     return job
@@ -1,86 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import Project
-from .schemas import ProjectCreate, ProjectResponse, ProjectUpdate
+from ..services.cache import cache_delete, cache_get, cache_set
+from .schemas import (
+    JSON_ENCODER,
+    ProjectCreate,
+    ProjectResponse,
+    ProjectResponseMS,
+    ProjectUpdate
+)
 
 router = APIRouter()
 
+PROJECTS_CACHE_KEY = "projects:all"
 
-@router.get("", response_model=List[ProjectResponse])
-def list_projects(db: Session = Depends(get_db)):
+# Built once at import; execution hits SQLAlchemy's compiled-SQL cache
+# without re-running statement construction per request
+LIST_PROJECTS_STMT = select(
+    Project.id, Project.name, Project.description, Project.created_at
+)
+
+
+@router.get("")
+async def list_projects(db: AsyncSession = Depends(get_async_db)):
     """List all projects."""
-    projects = db.query(Project).all()
-    return projects
+    cached = await cache_get(PROJECTS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Column-only select: plain Row tuples, no ORM hydration or
+    # identity-map bookkeeping per row
+    rows = await db.execute(LIST_PROJECTS_STMT)
+    # Encode straight through msgspec; no response_model revalidation pass
+    content = JSON_ENCODER.encode([ProjectResponseMS(*row) for row in rows])
+    await cache_set(PROJECTS_CACHE_KEY, content)
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("", response_model=ProjectResponse)
-def create_project(
+async def create_project(
     project_data: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project."""
-    # Check if project with this name already exists
-    existing = db.query(Project).filter(Project.name == project_data.name).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Project with this name already exists")
-
     project = Project(
         name=project_data.name,
         description=project_data.description
     )
 
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    # The unique constraint on name is the real check; no pre-SELECT needed
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Project with this name already exists")
+    await db.refresh(project)
+    await cache_delete(PROJECTS_CACHE_KEY)
 
     return project
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: UUID,
     update_data: ProjectUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     if update_data.name is not None:
-        # Check for name conflicts
-        existing = db.query(Project).filter(
-            Project.name == update_data.name,
-            Project.id != project_id
-        ).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Project with this name already exists")
         project.name = update_data.name
 
     if update_data.description is not None:
         project.description = update_data.description
 
-    db.commit()
-    db.refresh(project)
+    # Name conflicts surface from the unique constraint instead of a
+    # separate pre-SELECT
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Project with this name already exists")
+    await db.refresh(project)
+    await cache_delete(PROJECTS_CACHE_KEY)
 
     return project
 
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
+    await cache_delete(PROJECTS_CACHE_KEY)
 
     return {"message": "Project deleted successfully"}
@@ -1,16 +1,37 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import Provider
-from .schemas import ProviderResponse
+from ..services.cache import cache_get, cache_set
+from .schemas import JSON_ENCODER, ProviderResponseMS
 
 router = APIRouter()
 
+PROVIDERS_CACHE_KEY = "providers:all"
 
-@router.get("", response_model=List[ProviderResponse])
-def list_providers(db: Session = Depends(get_db)):
+# Built once at import; execution hits SQLAlchemy's compiled-SQL cache
+# without re-running statement construction per request
+LIST_PROVIDERS_STMT = select(
+    Provider.id, Provider.name, Provider.display_name,
+    Provider.base_api_url, Provider.schema_version, Provider.notes
+)
+
+
+@router.get("")
+async def list_providers(db: AsyncSession = Depends(get_async_db)):
     """List all available providers."""
-    providers = db.query(Provider).all()
-    return providers
+    # Providers are near-immutable; serve the encoded payload from Redis
+    # when available instead of hitting Postgres on every call
+    cached = await cache_get(PROVIDERS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Column-only select: plain Row tuples, no ORM hydration or
+    # identity-map bookkeeping per row
+    rows = await db.execute(LIST_PROVIDERS_STMT)
+    # Encode straight through msgspec; no response_model revalidation pass
+    content = JSON_ENCODER.encode([ProviderResponseMS(*row) for row in rows])
+    await cache_set(PROVIDERS_CACHE_KEY, content)
+    return Response(content=content, media_type="application/json")
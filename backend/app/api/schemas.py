@@ -1,9 +1,33 @@
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
 
+# msgspec Structs for the hottest list endpoints. These are pure data
+# shuttles: construction is positional, encoding runs in C, and no
+# validation pass happens on rows the database already guarantees.
+class ProviderResponseMS(msgspec.Struct):
+    id: UUID
+    name: str
+    display_name: str
+    base_api_url: Optional[str]
+    schema_version: Optional[str]
+    notes: Optional[str]
+
+
+class ProjectResponseMS(msgspec.Struct):
+    id: UUID
+    name: str
+    description: Optional[str]
+    created_at: datetime
+
+
+# Shared encoder instance; msgspec encoders are cheap to call but not to build
+JSON_ENCODER = msgspec.json.Encoder()
+
+
 # Provider Schemas
 class ProviderResponse(BaseModel):
     id: UUID
@@ -13,8 +37,7 @@ class ProviderResponse(BaseModel):
     schema_version: Optional[str]
     notes: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # API Key Schemas
@@ -32,8 +55,7 @@ class APIKeyResponse(BaseModel):
     created_at: datetime
     last_used_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class APIKeyUpdate(BaseModel):
@@ -53,8 +75,7 @@ class ProjectResponse(BaseModel):
     description: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectUpdate(BaseModel):
@@ -83,8 +104,7 @@ class ImportJobResponse(BaseModel):
     messages_imported: int
     artifacts_imported: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Message Schemas
@@ -97,8 +117,7 @@ class MessageResponse(BaseModel):
     content: str
     raw_metadata: Optional[Dict[str, Any]]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Artifact Schemas
@@ -113,8 +132,7 @@ class ArtifactResponse(BaseModel):
     download_error: Optional[str]
     notes: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Conversation Schemas
@@ -127,8 +145,7 @@ class ConversationListItem(BaseModel):
     has_artifacts: bool = False
     projects: List[str] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ConversationDetail(BaseModel):
@@ -144,8 +161,12 @@ class ConversationDetail(BaseModel):
     artifacts: List[ArtifactResponse]
     projects: List[ProjectResponse]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ConversationListPage(BaseModel):
+    items: List[ConversationListItem]
+    next_cursor: Optional[str] = None
 
 
 class ConversationProjectAssign(BaseModel):
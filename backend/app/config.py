@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
 
@@ -15,13 +15,24 @@ class Settings(BaseSettings):
     # Security
     secret_key: str
     encryption_key: str
+    # Opt-in cache of decrypted API keys (plaintext stays in process
+    # memory); flush via encryption.clear_decrypt_cache() on rotation
+    decrypt_cache_enabled: bool = False
+
+    # Optional Redis cache; caching is disabled when unset
+    redis_url: str = ""
+
+    # CORS is off unless explicitly enabled; origins is a comma-separated
+    # list — a finite set takes Starlette's fast matching path
+    cors_enabled: bool = False
+    cors_origins: str = "http://localhost:7025"
 
     # Environment
     env: str = "development"
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, frozen=True
+    )
 
 
 @lru_cache()
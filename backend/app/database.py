@@ -1,25 +1,40 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from .config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
+# Pool tuning shared by both engines: keep enough warm connections for the
+# request path plus background imports, recycle before idle timeouts kill
+# them server-side, and prefer recently-used connections (LIFO) so the pool
+# can shrink when load drops
+POOL_OPTIONS = dict(
+    pool_size=25,
+    max_overflow=10,
     pool_pre_ping=True,
-    echo=settings.env == "development"
+    pool_recycle=1800,
+    pool_use_lifo=True
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async engine over asyncpg so DB I/O releases the event loop instead of
+# blocking it; every router now goes through this engine
+async_engine = create_async_engine(
+    settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+    echo=settings.env == "development",
+    insertmanyvalues_page_size=1000,
+    # Generous compiled-SQL cache so every hot statement stays resident
+    query_cache_size=1200,
+    **POOL_OPTIONS
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database sessions."""
-    db = SessionLocal()
-    try:
+async def get_async_db():
+    """Dependency for getting async database sessions."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
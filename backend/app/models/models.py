@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, ForeignKey,
-    DateTime, Index, UniqueConstraint
+    DateTime, Index, LargeBinary, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -35,7 +35,7 @@ class APIKey(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id"), nullable=False)
     label = Column(String(200), nullable=False)
-    key_encrypted = Column(Text, nullable=False)  # Encrypted API key
+    key_encrypted = Column(LargeBinary, nullable=False)  # Encrypted API key (raw AES-CBC+HMAC frame)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_used_at = Column(DateTime(timezone=True), nullable=True)
@@ -72,20 +72,40 @@ class Conversation(Base):
     import_job_id = Column(UUID(as_uuid=True), ForeignKey("import_jobs.id"), nullable=True)
     import_notes = Column(Text, nullable=True)
     archived = Column(Boolean, default=False, nullable=False)
-    raw_metadata = Column(JSONB, nullable=True)
+    # none_as_null stores SQL NULL rather than JSON null for absent metadata
+    raw_metadata = Column(JSONB(none_as_null=True), nullable=True)
+
+    # Denormalized aggregates maintained at import time so listing never
+    # recomputes them from messages/artifacts
+    message_count = Column(Integer, default=0, server_default='0', nullable=False)
+    has_artifacts = Column(Boolean, default=False, server_default='false', nullable=False)
 
     # Relationships
     provider = relationship("Provider", back_populates="conversations")
-    import_job = relationship("ImportJob", back_populates="conversations")
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
+    import_job = relationship("ImportJob", back_populates="conversations", lazy="raise_on_sql")
+    messages = relationship(
+        "Message",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by="Message.sequence_index"  # served by idx_message_sequence
+    )
     artifacts = relationship("Artifact", back_populates="conversation", cascade="all, delete-orphan")
     conversation_projects = relationship("ConversationProject", back_populates="conversation", cascade="all, delete-orphan")
-    edits = relationship("ConversationEdit", back_populates="conversation", cascade="all, delete-orphan")
+    # raise_on_sql turns a forgotten eager-load into an immediate error
+    # instead of a silent per-row query
+    edits = relationship(
+        "ConversationEdit", back_populates="conversation",
+        cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
 
     __table_args__ = (
         UniqueConstraint('provider_id', 'provider_conversation_id', name='uq_provider_conversation'),
         Index('idx_conversation_started_at', 'started_at'),
-        Index('idx_conversation_provider', 'provider_id'),
+        # Composite indexes matching the listing query: filter by provider
+        # (or archived) then read in started_at order off the same index,
+        # with no separate sort step
+        Index('idx_conv_provider_started', provider_id, started_at.desc()),
+        Index('idx_conv_archived_started', 'archived', 'started_at'),
     )
 
 
@@ -112,15 +132,23 @@ class Message(Base):
     created_at = Column(DateTime(timezone=True), nullable=True)
     sequence_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
-    raw_metadata = Column(JSONB, nullable=True)
+    raw_metadata = Column(JSONB(none_as_null=True), nullable=True)
 
     # Relationships
     conversation = relationship("Conversation", back_populates="messages")
     artifacts = relationship("Artifact", back_populates="message")
 
     __table_args__ = (
-        Index('idx_message_conversation', 'conversation_id'),
+        # conversation_id lookups are covered by the leading column of
+        # idx_message_sequence; a separate single-column index is redundant
         Index('idx_message_sequence', 'conversation_id', 'sequence_index'),
+        # jsonb_path_ops serves @> containment queries on message metadata
+        # with a smaller index than the default jsonb_ops
+        Index(
+            'idx_message_meta_gin', 'raw_metadata',
+            postgresql_using='gin',
+            postgresql_ops={'raw_metadata': 'jsonb_path_ops'}
+        ),
     )
 
 
@@ -139,7 +167,7 @@ class Artifact(Base):
     download_status = Column(String(50), default="pending")  # 'success', 'not_supported', 'error', 'pending'
     download_error = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
-    raw_metadata = Column(JSONB, nullable=True)
+    raw_metadata = Column(JSONB(none_as_null=True), nullable=True)
 
     # Relationships
     conversation = relationship("Conversation", back_populates="artifacts")
@@ -160,7 +188,7 @@ class ImportJob(Base):
     started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     finished_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(String(50), default="running")  # 'running', 'success', 'partial', 'failed'
-    requested_range = Column(JSONB, nullable=True)  # e.g., {"from_date": "...", "to_date": "..."}
+    requested_range = Column(JSONB(none_as_null=True), nullable=True)  # e.g., {"from_date": "...", "to_date": "..."}
     summary = Column(Text, nullable=True)
     error_details = Column(Text, nullable=True)
 
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+import uuid
 import httpx
 from .base import (
     ConversationProviderAdapter,
@@ -10,6 +11,11 @@ from .base import (
 )
 
 
+def _utcnow() -> datetime:
+    """Timezone-aware now; the timestamp columns are timezone=True."""
+    return datetime.now(timezone.utc)
+
+
 class AnthropicAdapter(ConversationProviderAdapter):
     """
     Anthropic / Claude provider adapter.
@@ -58,7 +64,7 @@ class AnthropicAdapter(ConversationProviderAdapter):
         return ProviderConversationDetail(
             provider_conversation_id=conversation_id,
             title="Placeholder Claude Conversation",
-            started_at=datetime.now(),
+            started_at=_utcnow(),
             ended_at=None,
             messages=[],
             artifacts=[],
@@ -116,22 +122,26 @@ class AnthropicAdapter(ConversationProviderAdapter):
         Returns:
             Normalized conversation detail
         """
-        provider_messages = [
-            ProviderMessage(
-                provider_message_id=None,
-                role=msg.get("role", "user"),
-                content=msg.get("content", ""),
-                created_at=None,
-                sequence_index=idx,
-                raw_metadata=msg.get("metadata")
+        # Preallocate and fill positionally: no list resizing while a large
+        # pasted conversation is normalized, and `or` skips building default
+        # values for keys that are present (the common case)
+        provider_messages = [None] * len(messages)
+        for idx, msg in enumerate(messages):
+            provider_messages[idx] = ProviderMessage(
+                None,
+                msg.get("role") or "user",
+                msg.get("content") or "",
+                None,
+                idx,
+                msg.get("metadata")
             )
-            for idx, msg in enumerate(messages)
-        ]
 
         return ProviderConversationDetail(
-            provider_conversation_id=f"manual_{datetime.now().timestamp()}",
+            # uuid4 stays unique when several manual imports land in the
+            # same millisecond, unlike the old timestamp-derived id
+            provider_conversation_id=f"manual_{uuid.uuid4().hex}",
             title=title,
-            started_at=datetime.now(),
+            started_at=_utcnow(),
             ended_at=None,
             messages=provider_messages,
             artifacts=[],
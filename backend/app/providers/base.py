@@ -4,7 +4,9 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 
-@dataclass
+# slots=True drops the per-instance __dict__ on DTOs that are allocated
+# once per message/artifact during imports
+@dataclass(slots=True)
 class ProviderMessage:
     """Normalized message from any provider."""
     provider_message_id: Optional[str]
@@ -15,7 +17,7 @@ class ProviderMessage:
     raw_metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderArtifact:
     """Normalized artifact/attachment from any provider."""
     provider_artifact_id: Optional[str]
@@ -29,7 +31,7 @@ class ProviderArtifact:
     raw_metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConversationSummary:
     """Lightweight conversation summary for listing."""
     provider_conversation_id: str
@@ -40,7 +42,7 @@ class ProviderConversationSummary:
     raw_metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConversationDetail:
     """Full conversation detail with messages and artifacts."""
     provider_conversation_id: str
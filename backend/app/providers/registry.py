@@ -1,4 +1,7 @@
-from typing import Dict
+import os
+import sys
+from types import MappingProxyType
+from typing import Callable, Dict, Tuple
 from .base import ConversationProviderAdapter
 from .openai_adapter import OpenAIAdapter
 from .anthropic_adapter import AnthropicAdapter
@@ -7,29 +10,134 @@ from .anthropic_adapter import AnthropicAdapter
 class ProviderRegistry:
     """Registry for managing provider adapters."""
 
-    def __init__(self):
+    def __init__(self, eager: bool = None):
+        # Factories construct adapters on first use so startup doesn't
+        # pay for providers a worker never touches; built instances are
+        # memoized into _adapters
+        self._factories: Dict[str, Callable[[], ConversationProviderAdapter]] = {}
         self._adapters: Dict[str, ConversationProviderAdapter] = {}
+        # Read-only view plus precomputed name tuple; registration is a
+        # startup-time event, lookups and listings are per-request
+        self._view = MappingProxyType(self._adapters)
+        self._frozen_names: Tuple[str, ...] = ()
+        # Integer-id dispatch table: resolve the name once, then index an
+        # array on every subsequent call
+        self._name_to_id: Dict[str, int] = {}
+        self._by_id: list = []
         self._register_default_providers()
 
+        # PROVIDERS_EAGER=1 pre-warms every adapter, for deployments that
+        # prefer paying construction at startup rather than first request
+        if eager is None:
+            eager = os.getenv("PROVIDERS_EAGER", "").lower() in ("1", "true", "yes")
+        if eager:
+            for name in self._frozen_names:
+                self.get_adapter(name)
+
     def _register_default_providers(self):
-        """Register built-in provider adapters."""
-        self.register(OpenAIAdapter())
-        self.register(AnthropicAdapter())
+        """Register built-in provider adapter factories."""
+        self.register_factories((
+            ("openai", OpenAIAdapter),
+            ("anthropic", AnthropicAdapter),
+        ))
+
+    def _refresh_names(self):
+        self._frozen_names = tuple(
+            dict.fromkeys([*self._factories, *self._adapters])
+        )
+        self._name_to_id = {
+            name: idx for idx, name in enumerate(self._frozen_names)
+        }
+        self._by_id = [self._adapters.get(name) for name in self._frozen_names]
+
+    def register_factory(self, name: str,
+                         factory: Callable[[], ConversationProviderAdapter]):
+        """Register a provider by factory; the adapter is built lazily."""
+        # Interned names let later lookups short-circuit on pointer
+        # identity inside the dict probe
+        self._factories[sys.intern(name)] = factory
+        self._refresh_names()
+
+    def register_factories(self, items):
+        """Bulk-register (name, factory) pairs with one dict.update and a
+        single name refresh instead of a method call per provider."""
+        self._factories.update(
+            (sys.intern(name), factory) for name, factory in items
+        )
+        self._refresh_names()
+
+    def register_all(self, adapters):
+        """Bulk-register constructed adapters the same way."""
+        self._adapters.update(
+            (sys.intern(adapter.provider_name), adapter) for adapter in adapters
+        )
+        self._refresh_names()
+
+    def register(self, adapter: ConversationProviderAdapter, *, replace: bool = False):
+        """Register an already-constructed provider adapter.
 
-    def register(self, adapter: ConversationProviderAdapter):
-        """Register a provider adapter."""
-        self._adapters[adapter.provider_name] = adapter
+        Duplicates raise unless replace=True; the check rides on a single
+        setdefault probe rather than a lookup-then-store pair, and a
+        silent overwrite no longer hides double registration.
+        """
+        name = sys.intern(adapter.provider_name)
+        if replace:
+            self._adapters[name] = adapter
+        else:
+            existing = self._adapters.setdefault(name, adapter)
+            if existing is not adapter:
+                raise ValueError(f"Provider already registered: {name}")
+        self._refresh_names()
+
+    def find_adapter(self, provider_name: str):
+        """Get a provider adapter by name, or None if unregistered.
+
+        The not-found path costs a dict miss rather than exception
+        machinery, so callers that probe names use this.
+        """
+        adapter = self._view.get(provider_name)
+        if adapter is None:
+            factory = self._factories.get(provider_name)
+            if factory is None:
+                return None
+            adapter = factory()
+            self._adapters[sys.intern(provider_name)] = adapter
+            self._by_id[self._name_to_id[provider_name]] = adapter
+        return adapter
 
     def get_adapter(self, provider_name: str) -> ConversationProviderAdapter:
-        """Get a provider adapter by name."""
-        if provider_name not in self._adapters:
+        """Get a provider adapter by name, raising for unknown names."""
+        adapter = self.find_adapter(provider_name)
+        if adapter is None:
             raise ValueError(f"Unknown provider: {provider_name}")
-        return self._adapters[provider_name]
+        return adapter
+
+    def get_adapter_id(self, provider_name: str) -> int:
+        """Resolve a provider name to its small integer id once; repeat
+        dispatch can then go through get_adapter_by_id's array index."""
+        return self._name_to_id[provider_name]
 
-    def list_providers(self) -> list[str]:
+    def get_adapter_by_id(self, adapter_id: int) -> ConversationProviderAdapter:
+        """Get an adapter by integer id — a list index, no string hashing."""
+        adapter = self._by_id[adapter_id]
+        if adapter is None:
+            adapter = self.get_adapter(self._frozen_names[adapter_id])
+        return adapter
+
+    def list_providers(self) -> Tuple[str, ...]:
         """List all registered provider names."""
-        return list(self._adapters.keys())
+        return self._frozen_names
+
+
+# Global registry instance, constructed on first attribute access
+# (PEP 562) so importing this module costs nothing extra
+_registry = None
 
 
-# Global registry instance
-provider_registry = ProviderRegistry()
+def __getattr__(name):
+    if name == "provider_registry":
+        global _registry
+        if _registry is None:
+            _registry = ProviderRegistry()
+        return _registry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,8 @@
-from .encryption import encrypt_api_key, decrypt_api_key
+from .encryption import (
+    encrypt_api_key,
+    decrypt_api_key,
+    encrypt_many,
+    decrypt_many,
+)
 
-__all__ = ["encrypt_api_key", "decrypt_api_key"]
+__all__ = ["encrypt_api_key", "decrypt_api_key", "encrypt_many", "decrypt_many"]
@@ -0,0 +1,42 @@
+"""Optional Redis cache for small, read-heavy endpoints.
+
+Enabled by setting REDIS_URL; when unset, every helper degrades to a
+no-op and handlers fall through to Postgres as before. Values are
+stored as already-encoded JSON bytes so cache hits skip query,
+hydration and serialization entirely.
+"""
+from typing import Optional
+
+from ..config import get_settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+settings = get_settings()
+
+_client = None
+if redis is not None and settings.redis_url:
+    _client = redis.from_url(settings.redis_url)
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached JSON bytes for key, or None on miss/disabled."""
+    if _client is None:
+        return None
+    return await _client.get(key)
+
+
+async def cache_set(key: str, value: bytes, ttl: int = 3600) -> None:
+    """Store already-encoded JSON bytes under key."""
+    if _client is None:
+        return
+    await _client.set(key, value, ex=ttl)
+
+
+async def cache_delete(key: str) -> None:
+    """Invalidate a key after a write to the underlying rows."""
+    if _client is None:
+        return
+    await _client.delete(key)
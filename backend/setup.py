@@ -0,0 +1,32 @@
+"""
+Optional native build for hot modules.
+
+Running `python setup.py build_ext --inplace` with Cython installed
+compiles the listed modules to C extensions, removing pure-Python
+interpreter overhead — schema construction on the request path and the
+encode/decode-heavy encryption wrappers. The build is entirely
+optional: without the resulting .so present, imports fall back to the
+plain .py modules with identical behaviour.
+
+    pip install cython
+    cd backend && python setup.py build_ext --inplace
+"""
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    raise SystemExit(
+        "Cython is required for the optional native build: pip install cython"
+    )
+
+setup(
+    name="aichathistory-native",
+    ext_modules=cythonize(
+        [
+            "app/api/schemas.py",
+            "app/services/encryption.py",
+        ],
+        language_level=3
+    ),
+)
@@ -126,13 +126,13 @@ async function loadConversations() {
     const providerId = document.getElementById('provider-filter').value;
     const projectId = document.getElementById('project-filter').value;
 
-    let url = '/conversations?page=1&page_size=50';
+    let url = '/conversations?page_size=50';
     if (search) url += `&search=${encodeURIComponent(search)}`;
     if (providerId) url += `&provider_id=${providerId}`;
     if (projectId) url += `&project_id=${projectId}`;
 
-    const conversations = await apiCall(url);
-    renderConversations(conversations);
+    const page = await apiCall(url);
+    renderConversations(page.items);
 }
 
 function renderConversations(conversations) {